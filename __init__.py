@@ -5,12 +5,13 @@ from time import sleep
 
 import pytz
 import requests
-from ovos_date_parser import nice_duration
+from ovos_date_parser import nice_duration, nice_date_time, extract_datetime
 from ovos_utils.time import to_local, now_local
 from ovos_workshop.decorators import intent_handler
 from ovos_workshop.intents import IntentBuilder
 from ovos_workshop.skills import OVOSSkill
-from skyfield.api import Topos, load
+from skyfield.api import Topos, load, wgs84
+from skyfield.nutationlib import iau2000b_radians
 
 try:
     import matplotlib.pyplot as plt
@@ -57,7 +58,10 @@ class ISSLocationSkill(OVOSSkill):
 
         lat = data['iss_position']['latitude']
         lon = data['iss_position']['longitude']
+        toponym = self.get_toponym(lat, lon)
+        return toponym, lat, lon, astronauts
 
+    def get_toponym(self, lat, lon):
         params = {
             "username": self.settings["geonames_user"],
             "lat": lat,
@@ -67,8 +71,8 @@ class ISSLocationSkill(OVOSSkill):
         land_names = "http://api.geonames.org/countryCodeJSON"
 
         # reverse geo
-        data = requests.get(ocean_names, params=params).json()
         try:
+            data = requests.get(ocean_names, params=params).json()
             toponym = "The " + data['ocean']['name']
         except:
 
@@ -87,7 +91,7 @@ class ISSLocationSkill(OVOSSkill):
                 toponym = "unknown"
         if not self.lang.lower().startswith("en") and toponym != "unknown":
             toponym = self.translator.translate(toponym, self.lang)
-        return toponym, lat, lon, astronauts
+        return toponym
 
     def update_picture(self, toponym, lat, lon, astronauts):
         try:
@@ -192,6 +196,59 @@ class ISSLocationSkill(OVOSSkill):
         }, wait=True)
         self.gui.release()
 
+    @intent_handler('where_iss_at.intent')
+    def handle_iss_at(self, message):
+        utterance = message.data.get("utterance", "")
+        extracted = extract_datetime(utterance, lang=self.lang,
+                                     anchorDate=now_local())
+        if not extracted:
+            return self.handle_iss(message)
+        dt = extracted[0]
+        when = nice_date_time(dt, lang=self.lang)
+
+        try:
+            predictions = SatellitePredictions()
+            if not predictions.in_range(dt):
+                self.speak_dialog("location.at.out_of_range", {
+                    "time": when
+                }, wait=True)
+                return
+            pos = predictions.get_positions([dt])[0]
+        except Exception as e:
+            self.log.exception(e)
+            self.speak_dialog("location.at.error", wait=True)
+            return
+
+        iss_lat = round(pos["latitude"], 4)
+        iss_lon = round(pos["longitude"], 4)
+        try:
+            toponym = self.get_toponym(iss_lat, iss_lon)
+            if self.use_gui:
+                try:
+                    caption = f"{toponym} Lat: {iss_lat}  Lon: {iss_lon}"
+                    image = self.generate_map(iss_lat, iss_lon)
+                    self.gui.show_image(image, caption=caption,
+                                        fill='PreserveAspectFit')
+                except Exception as e:
+                    self.log.exception(e)
+
+            if toponym == "unknown":
+                self.speak_dialog("location.at.unknown", {
+                    "time": when,
+                    "latitude": iss_lat,
+                    "longitude": iss_lon
+                }, wait=True)
+            else:
+                self.speak_dialog("location.at", {
+                    "time": when,
+                    "latitude": iss_lat,
+                    "longitude": iss_lon,
+                    "toponym": toponym
+                }, wait=True)
+            sleep(1)
+        finally:
+            self.gui.release()
+
     @intent_handler(IntentBuilder("WhoISSIntent").require("who").
                     require("onboard").require("iss"))
     def handle_who(self, message):
@@ -235,8 +292,11 @@ class SatellitePredictions:
     # taken from https://github.com/yuvadm/iss.guru/blob/master/iss/predictions.py
     ISS = "ISS (ZARYA)"
     STATIONS_URL = "http://celestrak.com/NORAD/elements/stations.txt"
+    STATIONS_FILE = "stations.txt"
+    MAX_TLE_AGE = 1  # days before the cached TLE file is downloaded again
+    MAX_EPOCH_DISTANCE = 3  # days either side of the TLE epoch we can propagate to
 
-    def __init__(self, lat, lon, altitude=0, tz="UTC", satellite=ISS, start=None, days=10):
+    def __init__(self, lat=None, lon=None, altitude=0, tz="UTC", satellite=ISS, start=None, days=10):
         self.lat = lat
         self.lon = lon
         self.altitude = altitude
@@ -244,9 +304,28 @@ class SatellitePredictions:
         self.start = start
         self.days = days
 
-        satellites = load.tle_file(self.STATIONS_URL)
-        self.satellite = {sat.name: sat for sat in satellites}[satellite]
-        self.location = Topos(latitude_degrees=self.lat, longitude_degrees=self.lon)
+        if isinstance(satellite, str):
+            satellite = self.load_satellite(satellite)
+        self.satellite = satellite
+        # the observer is only needed for rise/set predictions,
+        # sub-satellite positions do not depend on it
+        self.location = None
+        if lat is not None and lon is not None:
+            self.location = Topos(latitude_degrees=self.lat, longitude_degrees=self.lon)
+
+    @classmethod
+    def load_satellite(cls, name=ISS):
+        """load satellite from celestrak, refreshing stale cached TLEs"""
+        reload = not load.exists(cls.STATIONS_FILE) or \
+            load.days_old(cls.STATIONS_FILE) > cls.MAX_TLE_AGE
+        satellites = load.tle_file(cls.STATIONS_URL, reload=reload,
+                                   filename=cls.STATIONS_FILE)
+        return {sat.name: sat for sat in satellites}[name]
+
+    def in_range(self, dt):
+        """check if dt is close enough to the TLE epoch for a meaningful prediction"""
+        epoch = self.satellite.epoch.utc_datetime()
+        return abs(dt - epoch) <= timedelta(days=self.MAX_EPOCH_DISTANCE)
 
     @staticmethod
     def to_local_time(utc_iso: str):
@@ -306,6 +385,29 @@ class SatellitePredictions:
             "distance": int(distance.km),
         }
 
+    def get_positions(self, times):
+        """sub-satellite latitude, longitude and altitude (km) for a list of
+        timezone aware datetimes, propagated in a single vectorized call"""
+        ts = load.timescale()
+        t = ts.from_datetimes(times)
+        # the full IAU2000A nutation series dominates the propagation cost,
+        # the truncated model is far more precise than SGP4 itself
+        t._nutation_angles_radians = iau2000b_radians(t)
+        geocentric = self.satellite.at(t)
+        position = wgs84.geographic_position_of(geocentric)
+        return [
+            {
+                "time": dt,
+                "latitude": float(lat),
+                "longitude": float(lon),
+                "altitude": float(elevation),
+            }
+            for dt, lat, lon, elevation in zip(times,
+                                               position.latitude.degrees,
+                                               position.longitude.degrees,
+                                               position.elevation.km)
+        ]
+
     def get_prediction_events(self):
         t0, t1 = self.get_next_days()
 
@@ -365,5 +467,7 @@ if __name__ == "__main__":
     s.handle_when(Message(""))
     # The I S S will be over XXX in seven minutes twenty five seconds
     # It will be visible during seven minutes twenty five seconds
+    s.handle_iss_at(Message("", {"utterance": "where will the ISS be in 2 hours"}))
+    # At XXX the space station is at XXX latitude XXX longitude over XXX
     s.handle_about_iss_intent(Message(""))
     # The International Space Station is a modular space station in low Earth orbit. The ISS programme is a multi-national collaborative project between five participating space agencies: NASA ( United States ) , Roscosmos ( Russia ) , JAXA ( Japan ) , ESA ( Europe ) , and CSA ( Canada ) .The ownership and use of the space station is established by intergovernmental treaties and agreements.
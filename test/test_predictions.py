@@ -0,0 +1,101 @@
+import time
+import unittest
+from datetime import timedelta
+from unittest.mock import Mock, patch
+
+from ovos_utils.messagebus import FakeBus
+from ovos_bus_client.message import Message
+from skyfield.api import EarthSatellite, load
+
+import ovos_skill_iss_location
+from ovos_skill_iss_location import ISSLocationSkill, SatellitePredictions
+
+# fixed ISS elements, so tests never hit celestrak
+TLE = ("1 25544U 98067A   14020.93268519  .00009878  00000-0  18200-3 0  5082",
+       "2 25544  51.6498 109.4756 0003572  55.9686 274.8005 15.49815350868473")
+
+
+def make_predictions():
+    satellite = EarthSatellite(*TLE, SatellitePredictions.ISS, load.timescale())
+    return SatellitePredictions(satellite=satellite)
+
+
+class TestSatellitePredictions(unittest.TestCase):
+    @classmethod
+    def setUpClass(self):
+        self.predictions = make_predictions()
+        self.epoch = self.predictions.satellite.epoch.utc_datetime()
+        # one day at one minute resolution
+        self.times = [self.epoch + timedelta(minutes=i) for i in range(1440)]
+
+    def test_get_positions(self):
+        positions = self.predictions.get_positions(self.times)
+        self.assertEqual(len(positions), len(self.times))
+        self.assertEqual([p["time"] for p in positions], self.times)
+        for p in positions:
+            # 51.65 deg inclination is geocentric, the geodetic latitude
+            # of the sub-satellite point can be ~0.2 deg higher
+            self.assertLessEqual(abs(p["latitude"]), 51.9)
+            self.assertLessEqual(abs(p["longitude"]), 180)
+            self.assertTrue(380 < p["altitude"] < 450)
+
+    def test_get_positions_speed(self):
+        self.predictions.get_positions(self.times[:10])  # warm up
+        start = time.perf_counter()
+        self.predictions.get_positions(self.times)
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+    def test_in_range(self):
+        self.assertTrue(self.predictions.in_range(self.epoch + timedelta(days=1)))
+        self.assertTrue(self.predictions.in_range(self.epoch - timedelta(days=1)))
+        self.assertFalse(self.predictions.in_range(self.epoch + timedelta(days=365)))
+        self.assertFalse(self.predictions.in_range(self.epoch - timedelta(days=365)))
+
+
+@patch.object(ovos_skill_iss_location, "sleep", Mock())
+@patch.object(ovos_skill_iss_location, "SatellitePredictions", make_predictions)
+class TestWhereISSAt(unittest.TestCase):
+    def setUp(self):
+        self.skill = ISSLocationSkill()
+        self.skill._startup(FakeBus(), "ovos-skill-iss-location.openvoiceos")
+        self.skill.speak_dialog = Mock()
+        self.skill.get_toponym = Mock(return_value="The North Atlantic Ocean")
+        self.epoch = make_predictions().satellite.epoch.utc_datetime()
+        self.message = Message("", {"utterance": "where will the ISS be in two hours"})
+
+    def _handle(self, dt):
+        with patch.object(ovos_skill_iss_location, "extract_datetime",
+                          Mock(return_value=(dt, ""))):
+            self.skill.handle_iss_at(self.message)
+        return self.skill.speak_dialog.call_args
+
+    def test_toponym(self):
+        args = self._handle(self.epoch + timedelta(hours=2))
+        self.assertEqual(args[0][0], "location.at")
+        self.assertEqual(args[0][1]["toponym"], "The North Atlantic Ocean")
+        self.skill.get_toponym.assert_called_once()
+
+    def test_unknown_toponym(self):
+        self.skill.get_toponym.return_value = "unknown"
+        args = self._handle(self.epoch + timedelta(hours=2))
+        self.assertEqual(args[0][0], "location.at.unknown")
+
+    def test_out_of_range(self):
+        args = self._handle(self.epoch + timedelta(days=365))
+        self.assertEqual(args[0][0], "location.at.out_of_range")
+        self.skill.get_toponym.assert_not_called()
+
+    def test_error(self):
+        with patch.object(ovos_skill_iss_location, "SatellitePredictions",
+                          Mock(side_effect=ConnectionError)):
+            args = self._handle(self.epoch + timedelta(hours=2))
+        self.assertEqual(args[0][0], "location.at.error")
+        self.skill.get_toponym.assert_not_called()
+
+    def test_no_datetime(self):
+        self.skill.handle_iss = Mock()
+        with patch.object(ovos_skill_iss_location, "extract_datetime",
+                          Mock(return_value=None)):
+            self.skill.handle_iss_at(self.message)
+        self.skill.handle_iss.assert_called_once_with(self.message)
+        self.skill.speak_dialog.assert_not_called()